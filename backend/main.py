@@ -3,76 +3,172 @@ import os
 import tempfile
 import uuid
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import AsyncIterator, BinaryIO, List, Dict, Optional, Tuple, Union
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from contextlib import asynccontextmanager
-
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
+import collections
+import hashlib
+import mmap
+import struct
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
-import pdfplumber
+import aiofiles
 import torch
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 from TTS.api import TTS
 import soundfile as sf
+import numpy as np
 import re
 import json
+import multiprocessing
+
+from pdf_extract import (
+    SegmentBatch,
+    count_pdf_pages,
+    extract_page_segments,
+    pdf_worker_ready,
+)
 
 # Global variables for models
 tts_model = None
-text_analyzer = None
+tts_model_name = None
+pdf_executor: Optional[ProcessPoolExecutor] = None
+tts_executor: Optional[Union[ThreadPoolExecutor, ProcessPoolExecutor]] = None
+tts_workers = 1
+tts_lock: Optional[asyncio.Lock] = None
 device = "cuda" if torch.cuda.is_available() else "cpu"
 
+# Number of segments handed to the TTS model per executor call, and the
+# character budget a single call may cover
+TTS_CHUNK_SIZE = int(os.getenv("TTS_CHUNK_SIZE", "8"))
+TTS_MAX_CHARS_PER_BATCH = int(os.getenv("TTS_MAX_CHARS_PER_BATCH", "512"))
+
+# Content-addressed cache of synthesized audio, shared across jobs
+AUDIO_CACHE_DIR = Path(
+    os.getenv("TTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "tts_cache"))
+)
+AUDIO_CACHE_MAX_FILES = int(os.getenv("TTS_CACHE_MAX_FILES", "5000"))
+
+# Uploads are streamed to disk in chunks of this many bytes
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 # Storage for processing jobs
 processing_jobs = {}
 audio_files = {}
+audio_stores: Dict[str, str] = {}
+# Notified whenever a running job records a segment; removed once the job ends
+segment_conditions: Dict[str, asyncio.Condition] = {}
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global tts_model, text_analyzer
+    global tts_model, tts_model_name, pdf_executor, tts_executor, tts_workers
+    global tts_lock
 
     print(f"Using device: {device}")
 
+    # Worker processes for CPU-bound PDF parsing, one page per task. Spawned
+    # rather than forked, since forking after torch/CUDA init is unsafe; the
+    # workers only import the lightweight pdf_extract module
+    pdf_workers = os.cpu_count() or 1
+    pdf_executor = ProcessPoolExecutor(
+        max_workers=pdf_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+    # Start every worker now rather than during the first job
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        *(
+            loop.run_in_executor(pdf_executor, pdf_worker_ready)
+            for _ in range(pdf_workers)
+        )
+    )
+
+    AUDIO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
     # Initialize TTS model (using Coqui TTS)
     try:
         print("Loading TTS model...")
-        tts_model = TTS(
-            "tts_models/en/ljspeech/tacotron2-DDC", gpu=torch.cuda.is_available()
-        )
+        tts_model_name = "tts_models/en/ljspeech/tacotron2-DDC"
+        tts_model = TTS(tts_model_name, gpu=torch.cuda.is_available())
         print("TTS model loaded successfully")
     except Exception as e:
         print(f"Error loading TTS model: {e}")
         # Fallback to a simpler model
         try:
-            tts_model = TTS(
-                "tts_models/en/ljspeech/glow-tts", gpu=torch.cuda.is_available()
-            )
+            tts_model_name = "tts_models/en/ljspeech/glow-tts"
+            tts_model = TTS(tts_model_name, gpu=torch.cuda.is_available())
         except Exception as e2:
             print(f"Error loading fallback TTS model: {e2}")
             tts_model = None
 
-    # Initialize text analyzer for figure detection
-    try:
-        print("Loading text analyzer...")
-        text_analyzer = pipeline(
-            "text-classification",
-            model="microsoft/DialoGPT-medium",
-            device=0 if torch.cuda.is_available() else -1,
+    if device == "cpu" and tts_model is not None:
+        # CPU synthesis is embarrassingly parallel across segments, so give
+        # every core a worker process with its own model
+        tts_workers = os.cpu_count() or 1
+        tts_executor = ProcessPoolExecutor(
+            max_workers=tts_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_tts_worker,
+            initargs=(tts_model_name,),
         )
-        print("Text analyzer loaded successfully")
-    except Exception as e:
-        print(f"Error loading text analyzer: {e}")
-        text_analyzer = None
+
+        # Workers spawn lazily, so start them all now and wait for their models
+        # to load rather than charging that to the first job. The model loaded
+        # above stays in this process: it picks between the primary and fallback
+        # model before any worker is spawned, and it answers the availability
+        # checks and output sample rate without a round trip to a worker
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(tts_executor, tts_worker_ready)
+                for _ in range(tts_workers)
+            )
+        )
+    else:
+        # A single shared TTS thread; concurrent calls on one GPU only contend
+        tts_workers = 1
+        tts_executor = ThreadPoolExecutor(max_workers=1)
+
+    if device == "cuda" and tts_model is not None:
+        # Run leftover FP32 matmuls on TF32 cores. cuDNN autotuning stays off:
+        # every segment is synthesized unpadded, so nearly each one has a new
+        # input length and would trigger a fresh benchmark
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.set_float32_matmul_precision("high")
+
+        try:
+            print("Compiling TTS model...")
+            compile_tts_model(tts_model)
+            # Trigger compilation now, on the thread that will serve requests,
+            # so the first real request isn't penalized
+            tts_executor.submit(warm_up_tts_model, tts_model).result()
+            print("TTS model compiled successfully")
+        except Exception as e:
+            print(
+                f"WARNING: torch.compile failed, serving TTS in eager mode "
+                f"without compilation: {e}"
+            )
+            uncompile_tts_model(tts_model)
+            try:
+                tts_executor.submit(warm_up_tts_model, tts_model).result()
+            except Exception as e2:
+                print(f"Error warming up TTS model: {e2}")
+
+    # Coqui models aren't reentrant, so calls on the shared model are
+    # serialized explicitly rather than interleaved on one CUDA context
+    tts_lock = asyncio.Lock()
 
     yield
 
     # Shutdown
     print("Shutting down...")
+    pdf_executor.shutdown(wait=False, cancel_futures=True)
+    tts_executor.shutdown(wait=False, cancel_futures=True)
 
 
 app = FastAPI(title="PDF Voice Processor", lifespan=lifespan)
@@ -98,6 +194,7 @@ class TextSegment(BaseModel):
     page: int
     has_figure_reference: bool
     figure_references: List[str] = []
+    text_to_speak: str
 
 
 class ProcessingResult(BaseModel):
@@ -107,73 +204,126 @@ class ProcessingResult(BaseModel):
     status: str
 
 
-def extract_text_from_pdf(pdf_path: str) -> List[Dict]:
-    """Extract text from PDF with page information"""
-    segments = []
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages, 1):
-            text = page.extract_text()
-            if text and text.strip():
-                # Clean and segment the text
-                paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-
-                for paragraph in paragraphs:
-                    if len(paragraph) > 50:  # Filter out very short segments
-                        segments.append(
-                            {
-                                "text": paragraph,
-                                "page": page_num,
-                                "total_pages": len(pdf.pages),
-                            }
-                        )
+async def iter_page_segments(
+    pdf_path: str,
+) -> AsyncIterator[Tuple[int, int, SegmentBatch]]:
+    """Yield (page_num, total_pages, batch) for each page in page order"""
+    loop = asyncio.get_running_loop()
 
-    return segments
+    total_pages = await loop.run_in_executor(pdf_executor, count_pdf_pages, pdf_path)
 
+    # Pages are independent, so parse them in parallel across processes, but
+    # keep only a bounded window in flight so parsed pages don't pile up
+    window = os.cpu_count() or 1
+    pending = collections.deque()
+    next_page = 1
+
+    while next_page <= total_pages or pending:
+        while next_page <= total_pages and len(pending) < window:
+            pending.append(
+                loop.run_in_executor(
+                    pdf_executor, extract_page_segments, pdf_path, next_page
+                )
+            )
+            next_page += 1
+
+        page_num = next_page - len(pending)
+        yield page_num, total_pages, await pending.popleft()
+
+
+# Simple regex-based detection of figure, table and chart references.
+# Alternatives share their prefixes and "\s+\d+" tail so the matcher tries
+# four branches per position instead of nine.
+figure_patterns = [
+    r"(?:figure|table|chart|graph|diagram)\s+\d+",
+    r"see\s+(?:above|below)",
+    r"as\s+shown",
+    r"illustrated\s+in",
+]
+
+# Common abbreviations spelled out for TTS
+abbreviations = {
+    "et al.": "et al",
+    "e.g.": "for example",
+    "i.e.": "that is",
+    "vs.": "versus",
+    "etc.": "et cetera",
+}
+
+# Compiled once at import rather than on every call
+_WS_RE = re.compile(r"\s+")
+
+# Figure detection and TTS cleaning fused into one scan, dispatched on the
+# named group that matched. The abbreviation alternation replaces the old
+# per-abbreviation str.replace loop: overlapping abbreviations resolve by
+# leftmost match rather than by dictionary order, so e.g. "i.e.g." reads
+# "that isg." where it used to read "i.for example"; only such run-together
+# abbreviations are affected, and that is deliberate
+_TEXT_SCAN_RE = re.compile(
+    "|".join(
+        [
+            "(?P<figure>(?i:" + "|".join(figure_patterns) + "))",
+            "(?P<abbr>"
+            + "|".join(re.escape(abbr).replace(r"\ ", r"\s+") for abbr in abbreviations)
+            + ")",
+            r"(?P<ws>\s+)",
+            r"(?P<dotcap>[.,])(?=[A-Z])",
+        ]
+    )
+)
 
-def detect_figure_references(text: str) -> Dict:
-    """Detect if text references figures, tables, or charts"""
-    # Simple regex-based detection for now
-    figure_patterns = [
-        r"[Ff]igure\s+\d+",
-        r"[Tt]able\s+\d+",
-        r"[Cc]hart\s+\d+",
-        r"[Gg]raph\s+\d+",
-        r"[Dd]iagram\s+\d+",
-        r"see\s+above",
-        r"see\s+below",
-        r"as\s+shown",
-        r"illustrated\s+in",
-    ]
 
+def analyze_text_for_tts(text: str) -> Tuple[List[str], str]:
+    """Detect figure references and clean text for TTS in a single pass"""
     references = []
-    for pattern in figure_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        references.extend(matches)
+    pieces = []
+    last = 0
 
-    return {
-        "has_figure_reference": len(references) > 0,
-        "figure_references": references,
-    }
+    for match in _TEXT_SCAN_RE.finditer(text):
+        pieces.append(text[last : match.start()])
+        last = match.end()
 
+        kind = match.lastgroup
+        if kind == "figure":
+            references.append(match.group())
+            pieces.append(_WS_RE.sub(" ", match.group()))
+        elif kind == "abbr":
+            pieces.append(abbreviations[_WS_RE.sub(" ", match.group())])
+            # Keep the pause the abbreviation's period adds before a capital
+            if last < len(text) and "A" <= text[last] <= "Z":
+                pieces.append(" ")
+        elif kind == "ws":
+            pieces.append(" ")
+        else:
+            pieces.append(match.group() + " ")
 
-def process_text_segments(segments: List[Dict]) -> List[TextSegment]:
+    pieces.append(text[last:])
+
+    return references, "".join(pieces).strip()
+
+
+def process_text_segments(batch: SegmentBatch) -> List[TextSegment]:
     """Process text segments and detect figure references"""
     processed_segments = []
 
-    for segment in segments:
-        # Detect figure references
-        ref_info = detect_figure_references(segment["text"])
+    for text, page in zip(batch.texts, batch.pages.tolist()):
+        references, cleaned_text = analyze_text_for_tts(text)
 
-        # Clean text for better TTS
-        cleaned_text = clean_text_for_tts(segment["text"])
+        # Add figure reference announcements
+        text_to_speak = cleaned_text
+        if references:
+            reference_text = (
+                f"Please refer to {', '.join(references)} mentioned in this section. "
+            )
+            text_to_speak = reference_text + cleaned_text
 
         processed_segments.append(
             TextSegment(
                 text=cleaned_text,
-                page=segment["page"],
-                has_figure_reference=ref_info["has_figure_reference"],
-                figure_references=ref_info["figure_references"],
+                page=page,
+                has_figure_reference=len(references) > 0,
+                figure_references=references,
+                text_to_speak=text_to_speak,
             )
         )
 
@@ -182,60 +332,263 @@ def process_text_segments(segments: List[Dict]) -> List[TextSegment]:
 
 def clean_text_for_tts(text: str) -> str:
     """Clean text to make it more suitable for TTS"""
-    # Remove excessive whitespace
-    text = re.sub(r"\s+", " ", text)
-
-    # Add pauses for better speech rhythm
-    text = re.sub(r"\.([A-Z])", r". \1", text)
-    text = re.sub(r",([A-Z])", r", \1", text)
-
-    # Handle common abbreviations
-    abbreviations = {
-        "et al.": "et al",
-        "e.g.": "for example",
-        "i.e.": "that is",
-        "vs.": "versus",
-        "etc.": "et cetera",
-    }
+    # Shares the fused scan so the cleaning rules live in one place
+    return analyze_text_for_tts(text)[1]
+
+
+def bucket_texts_by_length(
+    texts: List[str],
+    chunk_size: int = TTS_CHUNK_SIZE,
+    max_chars: int = TTS_MAX_CHARS_PER_BATCH,
+) -> List[List[int]]:
+    """Greedily pack length-sorted text indices into buckets of similar work"""
+    buckets = []
+    bucket = []
+    bucket_chars = 0
+
+    # Short texts share a bucket until the character budget is spent; a text
+    # longer than the budget gets a bucket of its own
+    for i in sorted(range(len(texts)), key=lambda i: len(texts[i])):
+        size = len(texts[i])
+        if bucket and (len(bucket) >= chunk_size or bucket_chars + size > max_chars):
+            buckets.append(bucket)
+            bucket = []
+            bucket_chars = 0
+
+        bucket.append(i)
+        bucket_chars += size
+
+    if bucket:
+        buckets.append(bucket)
+
+    return buckets
+
+
+def audio_cache_path(text: str) -> Path:
+    """Cache location for the audio of a text under the loaded TTS model"""
+    key = hashlib.sha1(f"{tts_model_name}\0{text}".encode("utf-8")).hexdigest()
+    return AUDIO_CACHE_DIR / f"{key}.wav"
+
+
+def read_cached_audio(cache_path: Path) -> Optional[np.ndarray]:
+    """Read a cached waveform, or None if it is missing or unreadable"""
+    try:
+        os.utime(cache_path)  # mark as recently used
+        pcm, _ = sf.read(cache_path, dtype="int16")
+        return pcm
+    except Exception:
+        # Evicted by another worker or corrupt; synthesize it again instead
+        return None
+
+
+def evict_audio_cache(max_files: int = AUDIO_CACHE_MAX_FILES):
+    """Remove least recently used cache entries beyond max_files"""
+    entries = []
+    for path in AUDIO_CACHE_DIR.glob("*.wav"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue  # evicted concurrently by another job
+
+    entries.sort()
+    for _, path in entries[: max(0, len(entries) - max_files)]:
+        path.unlink(missing_ok=True)
+
+
+@contextmanager
+def tts_inference():
+    """Inference-only context, with FP16 autocast on CUDA"""
+    # Half-precision autocast lets Volta+ GPUs run the model on Tensor Cores
+    with torch.inference_mode(), torch.autocast(
+        device_type="cuda", dtype=torch.float16, enabled=device == "cuda"
+    ):
+        yield
+
+
+def _tts_modules(model: TTS) -> List[torch.nn.Module]:
+    """The spectrogram model and vocoder (if any) behind a TTS instance"""
+    synthesizer = model.synthesizer
+    modules = (synthesizer.tts_model, synthesizer.vocoder_model)
+    return [m for m in modules if m is not None]
+
+
+def compile_tts_model(model: TTS):
+    """Compile the inference passes the synthesizer calls with TorchInductor"""
+    # The synthesizer calls .inference() rather than forward(), so compiling
+    # the module itself would leave the hot path in eager mode. CUDA graphs
+    # ("reduce-overhead") are avoided: a replay overwrites the previous run's
+    # outputs, while Coqui's decoder keeps every step's output in a list and
+    # its recurrent state on the module between decode() calls
+    for module in _tts_modules(model):
+        module.inference = torch.compile(module.inference, dynamic=True)
+
 
-    for abbr, replacement in abbreviations.items():
-        text = text.replace(abbr, replacement)
+def uncompile_tts_model(model: TTS):
+    """Restore eager inference after a failed compile"""
+    for module in _tts_modules(model):
+        module.__dict__.pop("inference", None)
 
-    return text.strip()
 
+def warm_up_tts_model(model: TTS):
+    """Run a throwaway synthesis so CUDA init and kernel selection happen now"""
+    with tts_inference():
+        wav = np.asarray(model.synthesizer.tts("This is a warmup sentence."))
 
-async def generate_audio_for_segment(
-    segment: TextSegment, output_dir: str, segment_index: int
-) -> str:
-    """Generate audio for a single text segment"""
+    # A broken compiled graph can run without raising but produce garbage
+    if wav.size == 0 or not np.isfinite(wav).all():
+        raise RuntimeError("warmup synthesis produced no usable audio")
+
+
+def init_tts_worker(model_name: str):
+    """Load a private TTS model in a CPU synthesis worker process"""
+    global tts_model, tts_model_name
+
+    # Each worker gets one core; parallelism comes from the process count
+    torch.set_num_threads(1)
+    tts_model_name = model_name
+    tts_model = TTS(model_name, gpu=False)
+    warm_up_tts_model(tts_model)
+
+
+def tts_worker_ready() -> bool:
+    """No-op task used to start a CPU synthesis worker ahead of the first job"""
+    return tts_model is not None
+
+
+def synthesize_waveforms(texts: List[str]) -> List[Optional[np.ndarray]]:
+    """Synthesize a bucket of texts back-to-back as 16-bit PCM"""
+    sample_rate = tts_model.synthesizer.output_sample_rate
+    results = []
+
+    with tts_inference():
+        for text in texts:
+            try:
+                # Repeated boilerplate reuses earlier audio instead of re-synthesizing
+                cache_path = audio_cache_path(text)
+                pcm = read_cached_audio(cache_path)
+                if pcm is not None:
+                    results.append(pcm)
+                    continue
+
+                wav = np.asarray(tts_model.synthesizer.tts(text), dtype=np.float32)
+                # Peak-normalize the way Coqui's save_wav does so loudness is unchanged
+                peak = max(0.01, float(np.max(np.abs(wav)))) if wav.size else 1.0
+                pcm = (wav * (32767 / peak)).astype(np.int16)
+
+                # Write then rename so concurrent workers never read a partial file
+                tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                sf.write(tmp_path, pcm, sample_rate, format="WAV")
+                os.replace(tmp_path, cache_path)
+                results.append(pcm)
+            except Exception as e:
+                print(f"Error generating audio for {text[:50]!r}: {e}")
+                results.append(None)
+
+    return results
+
+
+async def generate_audio_for_texts(texts: List[str]) -> List[Optional[np.ndarray]]:
+    """Generate audio for a bucket of texts in one executor call, one text at a time"""
     global tts_model
 
     if not tts_model:
         raise HTTPException(status_code=500, detail="TTS model not available")
 
-    # Add figure reference announcements
-    text_to_speak = segment.text
-    if segment.has_figure_reference:
-        reference_text = f"Please refer to {', '.join(segment.figure_references)} mentioned in this section. "
-        text_to_speak = reference_text + text_to_speak
+    # Run TTS in the executor to avoid blocking
+    loop = asyncio.get_event_loop()
+
+    # CPU worker processes each own a model and can run side by side
+    if tts_workers > 1:
+        return await loop.run_in_executor(tts_executor, synthesize_waveforms, texts)
+
+    async with tts_lock:
+        return await loop.run_in_executor(tts_executor, synthesize_waveforms, texts)
 
-    # Generate audio
-    output_file = os.path.join(output_dir, f"segment_{segment_index:04d}.wav")
 
+async def synthesize_bucket(
+    job_id: str,
+    texts: List[str],
+    segment_indices: List[int],
+    audio_store: BinaryIO,
+    semaphore: asyncio.Semaphore,
+):
+    """Synthesize one length bucket and append each waveform to the job's store"""
+    # The caller acquired the semaphore when it dispatched this bucket
     try:
-        # Run TTS in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            await loop.run_in_executor(
-                executor,
-                lambda: tts_model.tts_to_file(
-                    text=text_to_speak, file_path=output_file
-                ),
-            )
-        return output_file
+        results = await generate_audio_for_texts(texts)
     except Exception as e:
-        print(f"Error generating audio for segment {segment_index}: {e}")
-        raise
+        print(f"Error processing segments {segment_indices}: {e}")
+        results = [None] * len(texts)
+    finally:
+        semaphore.release()
+
+    # Buckets are length-sorted, so record each location at its segment index
+    for i, pcm in zip(segment_indices, results):
+        if pcm is None:
+            continue
+
+        sample_rate = tts_model.synthesizer.output_sample_rate
+        offset = audio_store.tell()
+        audio_store.write(pcm.astype("<i2", copy=False).tobytes())
+        audio_store.flush()
+
+        audio_files[job_id][i] = {
+            "offset": offset,
+            "nframes": len(pcm),
+            "sr": sample_rate,
+        }
+
+    condition = segment_conditions[job_id]
+    async with condition:
+        condition.notify_all()
+
+
+async def dispatch_pending_segments(
+    job_id: str,
+    texts: List[str],
+    segment_indices: List[int],
+    audio_store: BinaryIO,
+    semaphore: asyncio.Semaphore,
+    bucket_tasks: List[asyncio.Task],
+    flush: bool,
+) -> Tuple[List[str], List[int]]:
+    """Hand length buckets to the TTS workers without waiting for them to finish
+
+    Returns the texts and segment indices held back for a later bucket.
+    """
+    buckets = bucket_texts_by_length(texts)
+
+    # While every worker is busy, let the last, partially filled bucket keep
+    # collecting texts; as soon as a worker is idle it gets whatever is pending.
+    # The oldest waiting segment is never held back, so nothing starves
+    held = []
+    oldest = min(segment_indices)
+    if (
+        not flush
+        and semaphore.locked()
+        and len(buckets[-1]) < TTS_CHUNK_SIZE
+        and all(segment_indices[i] != oldest for i in buckets[-1])
+    ):
+        held = buckets.pop()
+
+    # Earliest segments first, so playback can start as soon as possible
+    buckets.sort(key=lambda bucket: min(segment_indices[i] for i in bucket))
+
+    for bucket in buckets:
+        # Bounds the work in flight to one bucket per TTS worker
+        await semaphore.acquire()
+        task = asyncio.create_task(
+            synthesize_bucket(
+                job_id,
+                [texts[i] for i in bucket],
+                [segment_indices[i] for i in bucket],
+                audio_store,
+                semaphore,
+            )
+        )
+        bucket_tasks.append(task)
+
+    return [texts[i] for i in held], [segment_indices[i] for i in held]
 
 
 @app.post("/api/process-pdf")
@@ -250,14 +603,15 @@ async def process_pdf(background_tasks: BackgroundTasks, file: UploadFile = File
 
     # Initialize job status
     processing_jobs[job_id] = ProcessingStatus(stage="Uploading file...", progress=0)
+    segment_conditions[job_id] = asyncio.Condition()
 
     # Save uploaded file
     temp_dir = tempfile.mkdtemp()
     pdf_path = os.path.join(temp_dir, file.filename)
 
-    with open(pdf_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
+    async with aiofiles.open(pdf_path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
 
     # Start background processing
     background_tasks.add_task(process_pdf_background, job_id, pdf_path)
@@ -267,54 +621,88 @@ async def process_pdf(background_tasks: BackgroundTasks, file: UploadFile = File
 
 async def process_pdf_background(job_id: str, pdf_path: str):
     """Background task to process PDF"""
+    # Progress is updated in place rather than allocating a model per page
+    status = processing_jobs[job_id]
+
     try:
         # Stage 1: Extract text
-        processing_jobs[job_id] = ProcessingStatus(
-            stage="Extracting text from PDF...", progress=20
-        )
-
-        segments = extract_text_from_pdf(pdf_path)
-
-        # Stage 2: Process text segments
-        processing_jobs[job_id] = ProcessingStatus(
-            stage="Analyzing content for voice processing...", progress=40
-        )
-
-        processed_segments = process_text_segments(segments)
-
-        # Stage 3: Generate audio
-        processing_jobs[job_id] = ProcessingStatus(
-            stage="Generating AI voice...", progress=60
-        )
+        status.stage = "Extracting text from PDF..."
+        status.progress = 20
 
-        # Create output directory for audio files
+        # Create output directory; all segment audio is packed into one file
         audio_dir = tempfile.mkdtemp()
         audio_files[job_id] = []
-
-        total_segments = len(processed_segments)
-        for i, segment in enumerate(processed_segments):
+        audio_stores[job_id] = os.path.join(audio_dir, f"audio_{job_id}.bin")
+
+        # Processed segments are spilled to disk as pages stream through, so
+        # only the texts still waiting for audio are held in memory
+        segments_path = os.path.join(audio_dir, "segments.jsonl")
+        pending_texts = []
+        pending_indices = []
+        total_pages = 0
+        semaphore = asyncio.Semaphore(tts_workers)
+        bucket_tasks = []
+
+        with open(segments_path, "w", encoding="utf-8") as segments_file, open(
+            audio_stores[job_id], "wb"
+        ) as audio_store:
             try:
-                audio_file = await generate_audio_for_segment(segment, audio_dir, i)
-                audio_files[job_id].append(audio_file)
-
-                # Update progress
-                progress = 60 + (30 * (i + 1) / total_segments)
-                processing_jobs[job_id] = ProcessingStatus(
-                    stage=f"Generating audio segment {i+1}/{total_segments}...",
-                    progress=int(progress),
-                )
-            except Exception as e:
-                print(f"Error processing segment {i}: {e}")
-                continue
+                async for page_num, total_pages, page_batch in iter_page_segments(
+                    pdf_path
+                ):
+                    # Stage 2: Process text segments
+                    for segment in process_text_segments(page_batch):
+                        segments_file.write(segment.model_dump_json() + "\n")
+                        pending_indices.append(len(audio_files[job_id]))
+                        pending_texts.append(segment.text_to_speak)
+                        audio_files[job_id].append(None)
+
+                    # Stage 3: Generate audio in the background while pages keep
+                    # streaming in
+                    if pending_texts:
+                        pending_texts, pending_indices = (
+                            await dispatch_pending_segments(
+                                job_id,
+                                pending_texts,
+                                pending_indices,
+                                audio_store,
+                                semaphore,
+                                bucket_tasks,
+                                flush=page_num == total_pages,
+                            )
+                        )
+
+                    # Update progress
+                    progress = 20 + (70 * page_num / total_pages)
+                    status.stage = (
+                        f"Generating AI voice for page {page_num}/{total_pages}..."
+                    )
+                    status.progress = int(progress)
+
+                await asyncio.gather(*bucket_tasks)
+            finally:
+                # Stop buckets still in flight from writing to a closed store
+                for task in bucket_tasks:
+                    task.cancel()
+
+        # Trim the audio cache once per job; it globs the whole cache directory
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, evict_audio_cache)
 
         # Stage 4: Finalize
-        processing_jobs[job_id] = ProcessingStatus(stage="Finalizing...", progress=100)
+        status.stage = "Finalizing..."
+        status.progress = 100
+
+        with open(segments_path, encoding="utf-8") as segments_file:
+            processed_segments = [
+                TextSegment.model_validate_json(line) for line in segments_file
+            ]
 
         # Store final result
         processing_jobs[job_id] = ProcessingResult(
             job_id=job_id,
             segments=processed_segments,
-            total_pages=segments[0]["total_pages"] if segments else 0,
+            total_pages=total_pages,
             status="completed",
         )
 
@@ -323,6 +711,11 @@ async def process_pdf_background(job_id: str, pdf_path: str):
             stage=f"Error: {str(e)}", progress=0, message=str(e)
         )
         print(f"Error processing PDF for job {job_id}: {e}")
+    finally:
+        # Wake stream consumers so they see that no more segments are coming
+        condition = segment_conditions.pop(job_id)
+        async with condition:
+            condition.notify_all()
 
 
 @app.get("/api/status/{job_id}")
@@ -334,25 +727,148 @@ async def get_processing_status(job_id: str):
     return processing_jobs[job_id]
 
 
+def wav_header(nframes: int, sample_rate: int) -> bytes:
+    """RIFF header for mono 16-bit PCM audio"""
+    data_size = nframes * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        1,  # mono
+        sample_rate,
+        sample_rate * 2,  # byte rate
+        2,  # block align
+        16,  # bits per sample
+        b"data",
+        data_size,
+    )
+
+
+def parse_byte_range(
+    range_header: Optional[str], size: int
+) -> Optional[Tuple[int, int]]:
+    """Parse a single-range Range header into an inclusive (start, end) pair"""
+    if not range_header:
+        return None
+
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None  # unsupported or multi-range, serve the whole file
+
+    match = re.fullmatch(r"(\d*)-(\d*)", spec.strip())
+    if not match or not any(match.groups()):
+        return None  # syntactically invalid, ignored per RFC 9110
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None  # last byte before first is invalid, not unsatisfiable
+    else:
+        start = max(0, size - int(last))  # suffix range, e.g. "bytes=-500"
+        end = size - 1
+
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}", "Accept-Ranges": "bytes"},
+        )
+    return start, min(end, size - 1)
+
+
 @app.get("/api/audio/{job_id}/{segment_index}")
-async def get_audio_segment(job_id: str, segment_index: int):
-    """Get audio file for a specific segment"""
+async def get_audio_segment(
+    job_id: str,
+    segment_index: int,
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+):
+    """Get audio for a specific segment"""
     if job_id not in audio_files:
         raise HTTPException(status_code=404, detail="Audio files not found")
 
     if segment_index >= len(audio_files[job_id]):
         raise HTTPException(status_code=404, detail="Segment not found")
 
-    audio_file = audio_files[job_id][segment_index]
+    entry = audio_files[job_id][segment_index]
 
-    if not os.path.exists(audio_file):
+    if entry is None or not os.path.exists(audio_stores[job_id]):
         raise HTTPException(status_code=404, detail="Audio file not found")
 
-    return FileResponse(
-        audio_file, media_type="audio/wav", filename=f"segment_{segment_index}.wav"
+    # The segment is served as a virtual WAV file: header followed by its PCM
+    # frames, which are sliced out of the job's packed audio store
+    header = wav_header(entry["nframes"], entry["sr"])
+    size = len(header) + entry["nframes"] * 2
+    byte_range = parse_byte_range(range_header, size)
+    start, end = byte_range if byte_range else (0, size - 1)
+
+    content = header[start : end + 1]
+    if end >= len(header):
+        pcm_start = entry["offset"] + max(start - len(header), 0)
+        pcm_end = entry["offset"] + end + 1 - len(header)
+        with open(audio_stores[job_id], "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as store:
+            content += store[pcm_start:pcm_end]
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="segment_{segment_index}.wav"',
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return Response(
+        content=content,
+        status_code=206 if byte_range else 200,
+        media_type="audio/wav",
+        headers=headers,
     )
 
 
+@app.get("/api/stream/{job_id}")
+async def stream_ready_segments(job_id: str):
+    """Stream segment indices as server-sent events once their audio is ready"""
+    if job_id not in processing_jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        # Each connection keeps its own cursor, so reconnects replay every ready segment
+        sent = set()
+
+        def unsent_segments() -> List[int]:
+            return [
+                i
+                for i, entry in enumerate(audio_files.get(job_id, []))
+                if entry is not None and i not in sent
+            ]
+
+        while True:
+            condition = segment_conditions.get(job_id)
+            if condition is not None:
+                async with condition:
+                    await condition.wait_for(
+                        lambda: job_id not in segment_conditions or unsent_segments()
+                    )
+
+            # Checked before scanning so segments recorded while yielding are not lost
+            finished = job_id not in segment_conditions
+            for segment_index in unsent_segments():
+                sent.add(segment_index)
+                yield f"data: {json.dumps({'segment': segment_index})}\n\n"
+
+            if finished:
+                yield "event: done\ndata: {}\n\n"
+                break
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.post("/api/synthesize-text")
 async def synthesize_text(text: str, speed: float = 1.0):
     """Synthesize speech for arbitrary text"""
@@ -361,25 +877,23 @@ async def synthesize_text(text: str, speed: float = 1.0):
     if not tts_model:
         raise HTTPException(status_code=500, detail="TTS model not available")
 
-    # Generate unique filename
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-
     try:
         # Clean text
         cleaned_text = clean_text_for_tts(text)
 
-        # Generate audio in thread pool
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            await loop.run_in_executor(
-                executor,
-                lambda: tts_model.tts_to_file(
-                    text=cleaned_text, file_path=temp_file.name
-                ),
-            )
-
-        return FileResponse(
-            temp_file.name, media_type="audio/wav", filename="synthesized_audio.wav"
+        # Generate audio in the TTS executor
+        [pcm] = await generate_audio_for_texts([cleaned_text])
+        if pcm is None:
+            raise RuntimeError("TTS synthesis failed")
+
+        sample_rate = tts_model.synthesizer.output_sample_rate
+        return Response(
+            content=wav_header(len(pcm), sample_rate)
+            + pcm.astype("<i2", copy=False).tobytes(),
+            media_type="audio/wav",
+            headers={
+                "Content-Disposition": 'attachment; filename="synthesized_audio.wav"'
+            },
         )
 
     except Exception as e:
@@ -394,7 +908,6 @@ async def health_check():
         "device": device,
         "cuda_available": torch.cuda.is_available(),
         "tts_model_loaded": tts_model is not None,
-        "text_analyzer_loaded": text_analyzer is not None,
     }
 
 
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pdfplumber
+import pypdfium2 as pdfium
+
+# Runs in the PDF worker processes. Spawned workers import this module rather
+# than main, so it must stay free of torch and TTS imports.
+
+
+@dataclass
+class SegmentBatch:
+    """Extracted paragraphs stored column-wise, one entry per paragraph"""
+
+    texts: List[str]
+    pages: np.ndarray  # int32 page number of each text
+
+
+def _segments_from_page_text(text: str, page_num: int) -> SegmentBatch:
+    """Split a page's text into paragraph segments"""
+    texts = []
+
+    if text and text.strip():
+        # Clean and segment the text
+        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+
+        # Filter out very short segments
+        texts = [paragraph for paragraph in paragraphs if len(paragraph) > 50]
+
+    return SegmentBatch(
+        texts=texts, pages=np.full(len(texts), page_num, dtype=np.int32)
+    )
+
+
+def _page_text_with_pdfium(pdf_path: str, page_num: int) -> str:
+    """Extract one page's text with PDFium's native text layer"""
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        page = pdf[page_num - 1]
+        textpage = page.get_textpage()
+        # PDFium separates lines with CRLF
+        text = textpage.get_text_range().replace("\r\n", "\n")
+        textpage.close()
+        page.close()
+    finally:
+        pdf.close()
+
+    return text
+
+
+def _page_text_with_pdfplumber(pdf_path: str, page_num: int) -> str:
+    """Extract one page's text with pdfplumber's pure-Python layout analysis"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return pdf.pages[page_num - 1].extract_text()
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    """Count the pages in a PDF"""
+    try:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    except Exception as e:
+        print(f"PDFium failed to open PDF, falling back to pdfplumber: {e}")
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+
+
+def extract_page_segments(pdf_path: str, page_num: int) -> SegmentBatch:
+    """Extract paragraph segments from a single page; runs in a worker process"""
+    try:
+        text = _page_text_with_pdfium(pdf_path, page_num)
+    except Exception as e:
+        print(f"PDFium failed on page {page_num}, falling back to pdfplumber: {e}")
+        text = _page_text_with_pdfplumber(pdf_path, page_num)
+
+    return _segments_from_page_text(text, page_num)
+
+
+def pdf_worker_ready() -> bool:
+    """No-op task used to start a PDF worker ahead of the first job"""
+    return True